@@ -6,3 +6,12 @@ ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 DB_NAME = os.path.join(BASE_DIR, 'database.db')
 COMPUTING_IMG = os.path.join(ASSETS_DIR, 'computing.png')
 DATABASE_IMG = os.path.join(ASSETS_DIR, 'database.png')
+JOURNAL_MAX_ENTRIES = 1000
+JOURNAL_COMPACTION_INTERVAL = 60
+# days after which deleted students are removed for good,
+# None keeps them forever.
+STUDENT_PURGE_DAYS = None
+SELECT_DEBOUNCE_MS = 40
+REFRESH_DEBOUNCE_MS = 80
+EVENT_REPORT_INTERVAL_MS = 60000
+LOG_LEVEL = os.environ.get('REGISTRATION_LOG_LEVEL', 'INFO')
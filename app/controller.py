@@ -1,4 +1,5 @@
 import sqlite3
+import threading
 import typing
 from app import constants
 from app.model import Model
@@ -16,6 +17,32 @@ class Controller:
     def __init__(self, view: 'View') -> None:
         self.model = Model(db_name=constants.DB_NAME)
         self.view = view
+        # students deleted in this session, the last one is undone first.
+        self.deleted_students: typing.List[typing.Tuple] = []
+        self.compaction_stopped = threading.Event()
+        self.compaction_thread = threading.Thread(
+            target=self._compact_journal_periodically, daemon=True
+        )
+        self.compaction_thread.start()
+
+    def _compact_journal_periodically(self) -> None:
+        """
+        Runs outside the tkinter loop so the journal compaction never
+        delays the interface or the regular queries.
+        """
+        while not self.compaction_stopped.wait(
+            constants.JOURNAL_COMPACTION_INTERVAL
+        ):
+            try:
+                if constants.STUDENT_PURGE_DAYS is not None:
+                    self.model.purge_students(constants.STUDENT_PURGE_DAYS)
+                self.model.compact_journal(constants.JOURNAL_MAX_ENTRIES)
+            except sqlite3.DatabaseError:
+                # the next round will try again.
+                pass
+
+    def stop_journal_compaction(self) -> None:
+        self.compaction_stopped.set()
 
     def _format_output_student(
         self,
@@ -90,7 +117,7 @@ class Controller:
         else:
             try:
                 self.view.clear_form_feedback()
-                self.model.update_student(
+                updated = self.model.update_student(
                     primary_key=primary_key,
                     name=formatted_name,
                     email=formatted_email,
@@ -117,20 +144,58 @@ class Controller:
             else:
                 self.view.form_display()
                 self.view.clear_form_fields()
-                self.view.showinfo('Success', 'Student has been updated.')
+                if updated:
+                    self.view.showinfo('Success', 'Student has been updated.')
+                else:
+                    self.view.showwarning(
+                        'Wait', 'Student no longer exists.'
+                    )
 
     def delete_student(self, primary_key: typing.Optional[int]) -> None:
         if primary_key:
             try:
+                student = self.model.select_student_by_primary_key(
+                    primary_key
+                )
                 self.model.delete_student(primary_key)
+                if student:
+                    self.deleted_students.append(student)
                 self.view.form_display()
                 self.view.clear_form_fields()
-                self.view.showinfo('Success', f'Student has been deleted.')
+                self.view.showinfo(
+                    'Success', 'Student has been deleted. Undo to restore.'
+                )
             except sqlite3.DatabaseError as error:
                 self.view.showwarning('error', str(error))
         else:
             self.view.showwarning('Wait', f'First select a register.')
 
+    def undo_delete_student(self) -> None:
+        if self.deleted_students:
+            student = self.deleted_students.pop()
+            try:
+                restored = self.model.restore_student(student[0])
+                self.view.form_display()
+                if restored:
+                    self.view.showinfo(
+                        'Success', f'Student {student[1]} has been restored.'
+                    )
+                else:
+                    self.view.showwarning(
+                        'Wait', f'Student {student[1]} can not be restored.'
+                    )
+            except sqlite3.IntegrityError:
+                # keep it, so the undo can be retried once the email is free.
+                self.deleted_students.append(student)
+                self.view.showwarning(
+                    'error',
+                    f'Email {student[2]} is already used by another student.',
+                )
+            except sqlite3.DatabaseError as error:
+                self.view.showwarning('error', str(error))
+        else:
+            self.view.showwarning('Wait', 'There is nothing to undo.')
+
     def select_students(self) -> typing.List:
         students = []
         select_results = self.model.select_students()
@@ -1,31 +1,191 @@
+import getpass
 import sqlite3
 import typing
 
 
+SCHEMA_VERSION = 1
+
+
 class Model:
     """
     Model layer.
     Offers operations for querying and manipulating records.
+
+    Students are not removed by delete_student, they are only marked
+    with deleted_at so the deletion can be undone, and purge_students
+    removes them for good later. Every change on the student table is
+    appended to student_journal by triggers, and compact_journal folds
+    the oldest entries into student_snapshot.
+
+    Model writes its actor in student.changed_by in the same statement
+    as the change, the triggers journal it and clear the column again.
+    Writes made outside Model are journaled with a null changed_by.
     """
 
-    def __init__(self, db_name: str = ':memory:') -> None:
+    def __init__(
+        self, db_name: str = ':memory:', actor: typing.Optional[str] = None
+    ) -> None:
         self.db_name = db_name
+        self.actor = actor or self._default_actor()
         self.create_tables()
 
+    def _default_actor(self) -> str:
+        try:
+            return getpass.getuser()
+        except (KeyError, OSError):
+            return 'unknown'
+
     def create_tables(self) -> None:
         with sqlite3.connect(self.db_name) as conn:
+            conn.execute('begin')
             conn.execute(
                 """
                 create table if not exists student (
                 idstudent integer primary key autoincrement,
                 name text not null,
-                email text unique,
+                email text,
                 sex text,
                 branch text,
-                programming text
+                programming text,
+                deleted_at text,
+                changed_by text
                 );
                 """
             )
+            version = conn.execute('pragma user_version').fetchone()[0]
+            if version < 1:
+                self.migrate_student_table(conn)
+            conn.execute(
+                """
+                create unique index if not exists student_email
+                on student(email) where deleted_at is null;
+                """
+            )
+            conn.execute(
+                """
+                create table if not exists student_journal (
+                idjournal integer primary key autoincrement,
+                idstudent integer not null,
+                operation text not null,
+                name text,
+                email text,
+                sex text,
+                branch text,
+                programming text,
+                changed_by text,
+                changed_at text not null
+                );
+                """
+            )
+            conn.execute(
+                """
+                create table if not exists student_snapshot (
+                idstudent integer primary key,
+                idjournal integer not null,
+                operation text not null,
+                name text,
+                email text,
+                sex text,
+                branch text,
+                programming text,
+                changed_by text,
+                changed_at text not null
+                );
+                """
+            )
+            self.create_journal_triggers(conn)
+            conn.execute(f'pragma user_version = {SCHEMA_VERSION}')
+
+    def migrate_student_table(self, conn: sqlite3.Connection) -> None:
+        """
+        Rebuild a student table created by older versions, where email
+        was unique even for deleted students.
+        """
+        columns = [
+            column[1] for column in conn.execute('pragma table_info(student)')
+        ]
+        for column in ('deleted_at', 'changed_by'):
+            if column not in columns:
+                conn.execute(f'alter table student add column {column} text')
+
+        sql = "select seq from sqlite_sequence where name='student'"
+        sequence = conn.execute(sql).fetchone()
+        conn.execute(
+            """
+            create table student_migration (
+            idstudent integer primary key autoincrement,
+            name text not null,
+            email text,
+            sex text,
+            branch text,
+            programming text,
+            deleted_at text,
+            changed_by text
+            );
+            """
+        )
+        conn.execute(
+            'insert into student_migration select idstudent, name, email, \
+            sex, branch, programming, deleted_at, changed_by from student'
+        )
+        conn.execute('drop table student')
+        conn.execute('alter table student_migration rename to student')
+        if sequence:
+            sql = "update sqlite_sequence set seq=max(seq, ?) \
+            where name='student'"
+            conn.execute(sql, sequence)
+
+    def create_journal_triggers(self, conn: sqlite3.Connection) -> None:
+        """
+        Triggers are dropped and created again, so changes made to them
+        also reach existing databases.
+        The update trigger only watches the student data, so clearing
+        changed_by does not create journal entries.
+        """
+        journal_insert = """
+            insert into student_journal
+            (idstudent, operation, name, email, sex, branch, programming,
+            changed_by, changed_at)
+            values ({row}.idstudent, '{operation}', {row}.name, {row}.email,
+            {row}.sex, {row}.branch, {row}.programming, {row}.changed_by,
+            strftime('%Y-%m-%d %H:%M:%f', 'now'));
+            update student set changed_by=null
+            where idstudent={row}.idstudent and changed_by is not null;
+        """
+        triggers = [
+            ('insert', 'after insert', '1', 'new'),
+            (
+                'update',
+                'after update of name, email, sex, branch, programming',
+                'new.deleted_at is null and old.deleted_at is null',
+                'new',
+            ),
+            (
+                'delete',
+                'after update of deleted_at',
+                'old.deleted_at is null and new.deleted_at is not null',
+                'new',
+            ),
+            (
+                'restore',
+                'after update of deleted_at',
+                'old.deleted_at is not null and new.deleted_at is null',
+                'new',
+            ),
+            ('purge', 'after delete', '1', 'old'),
+        ]
+        for operation, event, condition, row in triggers:
+            conn.execute(f'drop trigger if exists student_journal_{operation}')
+            conn.execute(
+                f"""
+                create trigger student_journal_{operation}
+                {event} on student
+                when {condition}
+                begin
+                {journal_insert.format(row=row, operation=operation)}
+                end;
+                """
+            )
 
     def insert_student(
         self,
@@ -37,18 +197,33 @@ class Model:
     ) -> int:
         with sqlite3.connect(self.db_name) as conn:
             sql = 'insert into student \
-            (name, email, sex, branch, programming) \
-            values (?, ?, ?, ?, ?)'
-            parameters = (name, email, sex, branch, programming)
+            (name, email, sex, branch, programming, changed_by) \
+            values (?, ?, ?, ?, ?, ?)'
+            parameters = (name, email, sex, branch, programming, self.actor)
             result = conn.execute(sql, parameters)
             return result.lastrowid
 
     def delete_student(self, primary_key: int) -> None:
         with sqlite3.connect(self.db_name) as conn:
-            sql = 'delete from student where idstudent=?'
-            parameters = (primary_key,)
+            sql = "update student \
+            set deleted_at=strftime('%Y-%m-%d %H:%M:%f', 'now'), \
+            changed_by=? where idstudent=? and deleted_at is null"
+            parameters = (self.actor, primary_key)
             conn.execute(sql, parameters)
 
+    def restore_student(self, primary_key: int) -> int:
+        """
+        Return the number of restored students.
+        Raise sqlite3.IntegrityError when a live student already took
+        the email of the restored one.
+        """
+        with sqlite3.connect(self.db_name) as conn:
+            sql = 'update student set deleted_at=null, changed_by=? \
+            where idstudent=? and deleted_at is not null'
+            parameters = (self.actor, primary_key)
+            result = conn.execute(sql, parameters)
+            return result.rowcount
+
     def update_student(
         self,
         primary_key: int,
@@ -57,16 +232,28 @@ class Model:
         sex: typing.Optional[str],
         branch: typing.Optional[str],
         programming: typing.Optional[str],
-    ) -> None:
+    ) -> int:
+        """Return the number of updated students."""
         with sqlite3.connect(self.db_name) as conn:
             sql = 'update student set name=?, email=?, sex=?, branch=?, \
-            programming=? where idstudent=?'
-            parameters = (name, email, sex, branch, programming, primary_key)
-            conn.execute(sql, parameters)
+            programming=?, changed_by=? where idstudent=? \
+            and deleted_at is null'
+            parameters = (
+                name,
+                email,
+                sex,
+                branch,
+                programming,
+                self.actor,
+                primary_key,
+            )
+            result = conn.execute(sql, parameters)
+            return result.rowcount
 
     def select_students(self) -> typing.List:
         with sqlite3.connect(self.db_name) as conn:
-            sql = 'select * from student'
+            sql = 'select idstudent, name, email, sex, branch, programming \
+            from student where deleted_at is null'
             result = conn.execute(sql)
             return result.fetchall()
 
@@ -74,7 +261,8 @@ class Model:
         self, email: typing.Optional[str]
     ) -> typing.Optional[typing.Tuple]:
         with sqlite3.connect(self.db_name) as conn:
-            sql = 'select * from student where email=?'
+            sql = 'select idstudent, name, email, sex, branch, programming \
+            from student where email=? and deleted_at is null'
             parameters = (email,)
             result = conn.execute(sql, parameters)
             return result.fetchone()
@@ -83,7 +271,51 @@ class Model:
         self, primary_key: int
     ) -> typing.Optional[typing.Tuple]:
         with sqlite3.connect(self.db_name) as conn:
-            sql = 'select * from student where idstudent = ?'
+            sql = 'select idstudent, name, email, sex, branch, programming \
+            from student where idstudent = ? and deleted_at is null'
             parameters = (primary_key,)
             result = conn.execute(sql, parameters)
             return result.fetchone()
+
+    def purge_students(self, days: int) -> int:
+        """
+        Remove for good the students deleted more than days ago.
+        Return the number of removed students.
+        """
+        with sqlite3.connect(self.db_name) as conn:
+            condition = "deleted_at < strftime('%Y-%m-%d %H:%M:%f', 'now', ?)"
+            parameters = (f'-{days} days',)
+            # a delete cannot set changed_by, so it is written first.
+            # updates of changed_by alone are not journaled.
+            sql = f'update student set changed_by=? where {condition}'
+            conn.execute(sql, (self.actor,) + parameters)
+            sql = f'delete from student where {condition}'
+            result = conn.execute(sql, parameters)
+            return result.rowcount
+
+    def compact_journal(self, max_entries: int) -> int:
+        """
+        Keep only the newest max_entries journal entries.
+        Older entries are folded into student_snapshot, which holds the
+        last known state of each student, and removed from the journal.
+        Return the number of removed entries.
+        """
+        with sqlite3.connect(self.db_name) as conn:
+            sql = 'select idjournal from student_journal \
+            order by idjournal desc limit 1 offset ?'
+            cutoff = conn.execute(sql, (max_entries,)).fetchone()
+            if cutoff is None:
+                return 0
+
+            sql = 'insert or replace into student_snapshot \
+            (idstudent, idjournal, operation, name, email, sex, branch, \
+            programming, changed_by, changed_at) \
+            select idstudent, idjournal, operation, name, email, sex, \
+            branch, programming, changed_by, changed_at \
+            from student_journal where idjournal in \
+            (select max(idjournal) from student_journal \
+            where idjournal <= ? group by idstudent)'
+            conn.execute(sql, cutoff)
+            sql = 'delete from student_journal where idjournal <= ?'
+            result = conn.execute(sql, cutoff)
+            return result.rowcount
@@ -1,4 +1,5 @@
 """Vision layer."""
+import logging
 import tkinter as tk
 import tkinter.ttk as ttk
 import typing
@@ -6,6 +7,9 @@ from app import constants
 from app.controller import Controller
 
 
+logger = logging.getLogger(__name__)
+
+
 class View(tk.Tk):
     """
     View layer.
@@ -14,6 +18,7 @@ class View(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
         self.controller = Controller(view=self)
+        self.events = EventCoalescer(master=self)
 
         self.screens_container = ttk.Frame(master=self)
         self.screens_container.pack(side='top', fill='both', expand=True)
@@ -23,12 +28,15 @@ class View(tk.Tk):
         self.apply_style()
 
         self.form_submit_button.configure(command=self.form_submit)
-        self.form_display_button.configure(command=self.form_display)
+        self.form_display_button.configure(command=self.request_form_display)
         self.form_update_button.configure(command=self.form_update)
         self.form_delete_button.configure(command=self.form_delete)
+        self.form_undo_button.configure(command=self.form_undo)
+        self.protocol('WM_DELETE_WINDOW', self.close)
         self.registers_treeview.bind(
             '<<TreeviewSelect>>', lambda e: self.fill_form()
         )
+        self.log_event_report()
 
     def apply_style(self) -> None:
         def travel(widget: tk.Misc, font: str) -> None:
@@ -77,7 +85,16 @@ class View(tk.Tk):
         programming = form.programming()
         self.controller.insert_student(name, email, sex, branch, programming)
 
+    def request_form_display(self) -> None:
+        """Reload the table, repeated clicks are merged into one reload."""
+        self.events.debounce(
+            'refresh', constants.REFRESH_DEBOUNCE_MS, self.form_display
+        )
+
     def form_display(self) -> None:
+        self.events.cancel('refresh')
+        self.events.cancel('select')
+        self.events.cancel('form')
         table = self.registers_screen.table
         students = self.controller.select_students()
         table.set_rows(students)
@@ -107,6 +124,18 @@ class View(tk.Tk):
             primary_key = selection[0]
         self.controller.delete_student(primary_key)
 
+    def form_undo(self) -> None:
+        self.controller.undo_delete_student()
+
+    def close(self) -> None:
+        self.controller.stop_journal_compaction()
+        logger.info('events: %s', self.events.report())
+        self.destroy()
+
+    def log_event_report(self) -> None:
+        logger.info('events: %s', self.events.report())
+        self.after(constants.EVENT_REPORT_INTERVAL_MS, self.log_event_report)
+
     def clear_form_fields(self) -> None:
         form = self.registers_screen.form
         form.name_input.set_text('')
@@ -132,25 +161,35 @@ class View(tk.Tk):
         WarningMessage(master=self, title=title, message=message)
 
     def fill_form(self) -> None:
-        form = self.registers_screen.form
+        """
+        Show the selected register in the form.
+        While the selection keeps changing (e.g. holding an arrow key)
+        only the last selection is loaded.
+        """
+        self.events.debounce(
+            'select', constants.SELECT_DEBOUNCE_MS, self.load_selected_student
+        )
+
+    def load_selected_student(self) -> None:
+        """The table row already holds the student, no query is needed."""
         table = self.registers_screen.table
-        selection = table.selection()
+        student = table.selection()
 
-        if selection:
-            primary_key = selection[0]
-            student = self.controller.select_student_by_primary_key(
-                primary_key
-            )
-            name = student[1]
-            email = student[2]
-            sex = student[3]
-            branch = student[4]
-            programming = student[5]
-            form.set_name(name)
-            form.set_email(email)
-            form.set_sex(sex)
-            form.set_branch(branch)
-            form.set_programming(programming)
+        if student:
+            self.events.idle('form', lambda: self.set_form(student))
+
+    def set_form(self, student: typing.Tuple) -> None:
+        form = self.registers_screen.form
+        name = student[1]
+        email = student[2]
+        sex = student[3]
+        branch = student[4]
+        programming = student[5]
+        form.set_name(name)
+        form.set_email(email)
+        form.set_sex(sex)
+        form.set_branch(branch)
+        form.set_programming(programming)
 
     @property
     def form_submit_button(self) -> ttk.Button:
@@ -168,11 +207,70 @@ class View(tk.Tk):
     def form_delete_button(self) -> ttk.Button:
         return self.registers_screen.form.delete_button
 
+    @property
+    def form_undo_button(self) -> ttk.Button:
+        return self.registers_screen.form.undo_button
+
     @property
     def registers_treeview(self) -> ttk.Treeview:
         return self.registers_screen.table.treeview
 
 
+class EventCoalescer:
+    """
+    Merge bursts of tkinter events.
+    Each request has a key, scheduling a key that is still pending
+    cancels the previous request, so only the latest one runs.
+    """
+
+    def __init__(self, master: tk.Misc) -> None:
+        self.master = master
+        self.pending: typing.Dict[str, str] = dict()
+        self.requested: typing.Dict[str, int] = dict()
+        self.dropped: typing.Dict[str, int] = dict()
+
+    def debounce(
+        self, key: str, delay: int, callback: typing.Callable[[], None]
+    ) -> None:
+        """Run callback after delay milliseconds without new requests."""
+        self._drop_pending(key)
+        self.pending[key] = self.master.after(
+            delay, lambda: self._run(key, callback)
+        )
+
+    def idle(self, key: str, callback: typing.Callable[[], None]) -> None:
+        """Run callback once tkinter has no other events to process."""
+        self._drop_pending(key)
+        self.pending[key] = self.master.after_idle(
+            lambda: self._run(key, callback)
+        )
+
+    def cancel(self, key: str) -> None:
+        after_id = self.pending.pop(key, None)
+        if after_id:
+            self.master.after_cancel(after_id)
+
+    def report(self) -> str:
+        reports = []
+        for key, requested in self.requested.items():
+            dropped = self.dropped.get(key, 0)
+            reports.append(
+                f'{key}: {requested} requested, {dropped} dropped '
+                f'({dropped / requested:.0%})'
+            )
+        return ', '.join(reports) or 'none requested'
+
+    def _drop_pending(self, key: str) -> None:
+        self.requested[key] = self.requested.get(key, 0) + 1
+        if key in self.pending:
+            self.dropped[key] = self.dropped.get(key, 0) + 1
+            self.cancel(key)
+
+    def _run(self, key: str, callback: typing.Callable[[], None]) -> None:
+        self.pending.pop(key, None)
+        callback()
+
+
 class RegistersScreen(ttk.Frame):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -249,6 +347,9 @@ class Form(ttk.Frame):
         self.delete_button = ttk.Button(master=self, text='Delete')
         self.delete_button.grid(row=7, column=1, sticky='nsew')
 
+        self.undo_button = ttk.Button(master=self, text='Undo delete')
+        self.undo_button.grid(row=8, column=0, columnspan=2, sticky='nsew')
+
     def name(self) -> str:
         return self.name_input.text()
 
@@ -1,5 +1,8 @@
+import logging
+from app import constants
 from app.view import View
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=constants.LOG_LEVEL)
     View().mainloop()
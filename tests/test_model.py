@@ -0,0 +1,147 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from app.model import Model
+
+
+class ModelTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_name = os.path.join(directory.name, 'database.db')
+
+    def journal(self) -> list:
+        with sqlite3.connect(self.db_name) as conn:
+            sql = 'select idstudent, operation, name, changed_by \
+            from student_journal order by idjournal'
+            return conn.execute(sql).fetchall()
+
+    def test_soft_delete_frees_email(self) -> None:
+        model = Model(self.db_name, actor='alice')
+        first = model.insert_student('a', 'a@x', None, None, None)
+        model.delete_student(first)
+        self.assertIsNone(model.select_student_by_email('a@x'))
+
+        second = model.insert_student('b', 'a@x', None, None, None)
+        self.assertEqual(model.select_student_by_email('a@x')[0], second)
+        with self.assertRaises(sqlite3.IntegrityError):
+            model.restore_student(first)
+
+    def test_update_deleted_student(self) -> None:
+        model = Model(self.db_name, actor='alice')
+        primary_key = model.insert_student('a', 'a@x', None, None, None)
+        model.delete_student(primary_key)
+        updated = model.update_student(
+            primary_key, 'b', None, None, None, None
+        )
+        self.assertEqual(updated, 0)
+
+    def test_journal_records_actor(self) -> None:
+        model = Model(self.db_name, actor='alice')
+        primary_key = model.insert_student('a', None, None, None, None)
+        Model(self.db_name, actor='bob').update_student(
+            primary_key, 'b', None, None, None, None
+        )
+        model.delete_student(primary_key)
+        model.restore_student(primary_key)
+        self.assertEqual(
+            self.journal(),
+            [
+                (primary_key, 'insert', 'a', 'alice'),
+                (primary_key, 'update', 'b', 'bob'),
+                (primary_key, 'delete', 'b', 'alice'),
+                (primary_key, 'restore', 'b', 'alice'),
+            ],
+        )
+
+    def test_restore_live_student(self) -> None:
+        model = Model(self.db_name, actor='alice')
+        primary_key = model.insert_student('a', None, None, None, None)
+        self.assertEqual(model.restore_student(primary_key), 0)
+        self.assertEqual(
+            self.journal(), [(primary_key, 'insert', 'a', 'alice')]
+        )
+
+    def test_plain_connection_can_write(self) -> None:
+        Model(self.db_name)
+        with sqlite3.connect(self.db_name) as conn:
+            conn.execute("insert into student (name) values ('a')")
+        self.assertEqual(self.journal(), [(1, 'insert', 'a', None)])
+
+    def test_plain_connection_is_not_attributed(self) -> None:
+        model = Model(self.db_name, actor='alice')
+        primary_key = model.insert_student('a', None, None, None, None)
+        with sqlite3.connect(self.db_name) as conn:
+            conn.execute("update student set name='b'")
+        model.update_student(primary_key, 'c', None, None, None, None)
+        self.assertEqual(
+            self.journal(),
+            [
+                (primary_key, 'insert', 'a', 'alice'),
+                (primary_key, 'update', 'b', None),
+                (primary_key, 'update', 'c', 'alice'),
+            ],
+        )
+
+    def test_purge_students(self) -> None:
+        model = Model(self.db_name, actor='alice')
+        primary_key = model.insert_student('a', None, None, None, None)
+        model.delete_student(primary_key)
+        self.assertEqual(model.purge_students(1), 0)
+
+        with sqlite3.connect(self.db_name) as conn:
+            conn.execute("update student set deleted_at='2000-01-01'")
+        self.assertEqual(model.purge_students(1), 1)
+        self.assertEqual(model.restore_student(primary_key), 0)
+        self.assertEqual(self.journal()[-1], (1, 'purge', 'a', 'alice'))
+
+    def test_compact_journal(self) -> None:
+        model = Model(self.db_name, actor='alice')
+        first = model.insert_student('a', None, None, None, None)
+        second = model.insert_student('b', None, None, None, None)
+        for index in range(5):
+            model.update_student(first, f'a{index}', None, None, None, None)
+
+        self.assertEqual(model.compact_journal(10), 0)
+        self.assertEqual(model.compact_journal(3), 4)
+        self.assertEqual(len(self.journal()), 3)
+        self.assertEqual(model.compact_journal(3), 0)
+        with sqlite3.connect(self.db_name) as conn:
+            sql = 'select idstudent, operation, name from student_snapshot \
+            order by idstudent'
+            snapshot = conn.execute(sql).fetchall()
+        self.assertEqual(
+            snapshot, [(first, 'update', 'a1'), (second, 'insert', 'b')]
+        )
+
+    def test_migrate_old_database(self) -> None:
+        with sqlite3.connect(self.db_name) as conn:
+            conn.execute(
+                """
+                create table student (
+                idstudent integer primary key autoincrement,
+                name text not null,
+                email text unique,
+                sex text,
+                branch text,
+                programming text
+                );
+                """
+            )
+            conn.execute(
+                "insert into student (name, email) values ('a', 'a@x')"
+            )
+            conn.execute("insert into student (name) values ('b')")
+            conn.execute('delete from student where idstudent=2')
+
+        model = Model(self.db_name, actor='alice')
+        self.assertEqual(
+            model.select_students(), [(1, 'a', 'a@x', None, None, None)]
+        )
+        model.delete_student(1)
+        primary_key = model.insert_student('c', 'a@x', None, None, None)
+        self.assertEqual(primary_key, 3)
+
+        Model(self.db_name, actor='alice')
+        self.assertEqual(model.select_student_by_email('a@x')[0], 3)
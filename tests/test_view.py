@@ -0,0 +1,53 @@
+import time
+import tkinter as tk
+import unittest
+from app.view import EventCoalescer
+
+
+class EventCoalescerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.master = tk.Tcl()
+        self.events = EventCoalescer(master=self.master)
+        self.addCleanup(self.cancel_pending)
+        self.calls: list = []
+
+    def cancel_pending(self) -> None:
+        for key in list(self.events.pending):
+            self.events.cancel(key)
+
+    def process_events(self) -> None:
+        time.sleep(0.02)
+        self.master.update()
+
+    def test_debounce_drops_superseded_requests(self) -> None:
+        for index in range(5):
+            self.events.debounce(
+                'select', 1, lambda index=index: self.calls.append(index)
+            )
+        self.process_events()
+        self.assertEqual(self.calls, [4])
+        self.assertEqual(self.events.pending, {})
+
+    def test_cancel_stops_pending_callback(self) -> None:
+        self.events.debounce('select', 1, lambda: self.calls.append(1))
+        self.events.cancel('select')
+        self.process_events()
+        self.assertEqual(self.calls, [])
+
+    def test_idle_runs_once(self) -> None:
+        self.events.idle('form', lambda: self.calls.append(1))
+        self.events.idle('form', lambda: self.calls.append(2))
+        self.process_events()
+        self.process_events()
+        self.assertEqual(self.calls, [2])
+
+    def test_report(self) -> None:
+        self.assertEqual(self.events.report(), 'none requested')
+        for _ in range(5):
+            self.events.debounce('select', 1, lambda: None)
+        self.events.idle('form', lambda: None)
+        self.assertEqual(
+            self.events.report(),
+            'select: 5 requested, 4 dropped (80%), '
+            'form: 1 requested, 0 dropped (0%)',
+        )